@@ -1,10 +1,34 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from sanic import Sanic
+from satellite_tracker import (
+    refresh_trackable_objects,
+    open_http_session,
+    close_http_session,
+    warm_up_kernels,
+)
+from satellite_tracker.tle_importer import REFRESH_INTERVAL_SECONDS
+from utils.risk_calculator import warm_up_risk_kernels
 from .routes.risk import bp as risk_blueprint
 from .routes.health import bp as health_blueprint
 from .routes.web import web_bp as web_blueprint
 from .routes.data import data_bp as data_blueprint
 
 
+async def _tle_refresher(app: Sanic):
+    """
+    Периодически обновляет каталог TLE в памяти.
+    """
+    while True:
+        await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+        try:
+            await refresh_trackable_objects()
+        except Exception as e:
+            print(f"Ошибка фонового обновления TLE: {e}")
+
+
 def create_app():
     """
     Application factory to create and configure the Sanic app.
@@ -22,4 +46,25 @@ def create_app():
     app.blueprint(web_blueprint)
     app.blueprint(data_blueprint)
 
+    @app.before_server_start
+    async def start_tle_refresher(app):
+        # JIT-компиляция ядер до приема запросов
+        warm_up_kernels()
+        warm_up_risk_kernels()
+
+        # Пул потоков для CPU-емких расчетов, чтобы не удерживать цикл событий.
+        # Процессы-воркеры Sanic - демоны и не могут порождать дочерние процессы,
+        # а тяжелая часть расчета (SGP4, NumPy) выполняется в C-коде
+        app.ctx.pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+        # Первичная загрузка каталога до приема запросов, далее - фоновое обновление
+        await open_http_session()
+        await refresh_trackable_objects()
+        app.add_task(_tle_refresher(app))
+
+    @app.after_server_stop
+    async def stop_http_session(app):
+        await close_http_session()
+        app.ctx.pool.shutdown(wait=False, cancel_futures=True)
+
     return app
@@ -1,14 +1,20 @@
+import asyncio
 from datetime import datetime, timezone, timedelta
+from typing import List, Type, TypeVar
 
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from sanic import Blueprint
 from sanic.response import json
 
 from satellite_tracker import (
+    TLECatalog,
     get_all_trackable_objects,
-    calculate_orbit_congestion_by_altitude,
-    calculate_satellite_position,
+    count_satellites_in_altitude_band,
+    filter_satellites_in_altitude_band,
+    calculate_positions_batch,
 )
-from utils.distance_calculation import quick_distance
+from utils.distance_calculation import haversine_np
 from utils.risk_calculator import (
     calculate_collision_financial_risk,
     calculate_launch_collision_risk,
@@ -16,6 +22,103 @@ from utils.risk_calculator import (
 
 bp = Blueprint("risks", url_prefix="/api")
 
+ParamsModel = TypeVar("ParamsModel", bound=BaseModel)
+
+# Верхняя граница длительности активного участка (с): выведение на орбиту
+# занимает минуты, а объем расчета растет линейно с числом моментов
+MAX_ASCENT_SECONDS = 3600
+# Число моментов времени, рассчитываемых за один пакет при поиске объектов в коридоре
+CORRIDOR_TIME_CHUNK = 64
+
+
+class OrbitRiskParams(BaseModel):
+    """
+    Параметры запроса /orbit_risk.
+    """
+
+    model_config = ConfigDict(allow_inf_nan=False)
+
+    height: float
+    A_effective: float
+    T_years: float
+    C_full: float
+    D_lost: float
+    V_rel: float = 12.5
+
+
+class TakeoffRiskParams(BaseModel):
+    """
+    Параметры запроса /takeoff_risk. Дата разбирается в обработчике,
+    чтобы сохранить понятное сообщение о формате.
+    """
+
+    model_config = ConfigDict(allow_inf_nan=False)
+
+    H_ascent: float = Field(gt=0)
+    A_rocket: float
+    T_seconds: float = Field(ge=0, le=MAX_ASCENT_SECONDS)
+    C_total_loss: float
+    lat: float
+    lon: float
+    date: str
+    launch_radius_meters: int = Field(50000, gt=0)
+    V_rel: float = 12.5
+
+
+def _parse_params(model: Type[ParamsModel], args) -> ParamsModel:
+    """
+    Проверяет и приводит типы параметров запроса скомпилированным валидатором модели.
+    Для повторяющихся параметров используется первое значение.
+    """
+    return model.model_validate({name: args.get(name) for name in args})
+
+
+def _validation_error(e: ValidationError, message: str):
+    """
+    Ответ 400 на ошибку валидации: отсутствующий параметр и нарушенное
+    ограничение значения называются явно, для ошибок типа возвращается
+    общее сообщение. Во всех случаях прикладывается список ошибок.
+    """
+    errors = e.errors(include_url=False, include_context=False)
+    for error in errors:
+        if error["type"] == "missing":
+            return json(
+                {"message": f"Missing required parameter: {error['loc'][0]}"}, status=400
+            )
+    for error in errors:
+        if not error["type"].endswith(("_parsing", "_type")):
+            message = f"Invalid value for parameter '{error['loc'][0]}': {error['msg']}"
+            break
+    return json({"message": message, "errors": errors}, status=400)
+
+
+def _count_objects_in_corridor(
+    catalog: TLECatalog,
+    h_ascent: float,
+    sample_times: List[datetime],
+    lat: float,
+    lon: float,
+    launch_cylinder_radius_m: int,
+) -> int:
+    """
+    Считает объекты, проходящие через коридор запуска.
+    Выполняется в пуле потоков над каталогом из памяти процесса.
+    """
+    filtered_satellites = filter_satellites_in_altitude_band(catalog, 0, h_ascent, 0, 180)
+
+    # Положения рассчитываются пакетами по CORRIDOR_TIME_CHUNK моментов,
+    # чтобы промежуточные массивы (объекты x моменты) оставались небольшими.
+    # SatrecArray строится один раз на каталог кандидатов и общий для всех пакетов
+    in_corridor = np.zeros(len(filtered_satellites), dtype=bool)
+    for start in range(0, len(sample_times), CORRIDOR_TIME_CHUNK):
+        positions = calculate_positions_batch(
+            filtered_satellites, sample_times[start:start + CORRIDOR_TIME_CHUNK]
+        )
+        distances_m = haversine_np(positions["lat"], positions["lon"], lat, lon)
+        in_corridor |= (distances_m < launch_cylinder_radius_m).any(axis=1)
+
+    return int(in_corridor.sum())
+
 
 @bp.get("/orbit_risk")
 async def orbit_collision_risk(request):
@@ -69,37 +172,33 @@ async def orbit_collision_risk(request):
           example: 12.5
     """
     try:
-        height = float(request.args["height"][0])
-        a_effective = float(request.args["A_effective"][0])
-        t_years = float(request.args["T_years"][0])
-        c_full = float(request.args["C_full"][0])
-        d_lost = float(request.args["D_lost"][0])
-        v_rel = (
-            float(request.args.get("V_rel")[0]) if request.args.get("V_rel") else 12.5
+        params = _parse_params(OrbitRiskParams, request.args)
+    except ValidationError as e:
+        return _validation_error(
+            e, "Invalid parameter type. Please provide valid numbers."
         )
 
-        all_objects = get_all_trackable_objects()
-        congestion_map, _ = calculate_orbit_congestion_by_altitude(
+    try:
+        height = params.height
+
+        all_objects = await get_all_trackable_objects()
+        total_objects_in_layer = count_satellites_in_altitude_band(
             all_objects, height - 50, height + 50, 0, 180
         )
 
-        total_objects_in_layer = sum(data["count"] for data in congestion_map.values())
-
         orbit_risk_data = calculate_collision_financial_risk(
             total_objects_in_layer,
             height + 50,
             height - 50,
-            v_rel,
-            a_effective,
-            t_years,
-            c_full,
-            d_lost,
+            params.V_rel,
+            params.A_effective,
+            params.T_years,
+            params.C_full,
+            params.D_lost,
         )
 
         return json(orbit_risk_data)
 
-    except KeyError as e:
-        return json({"message": f"Missing required parameter: {e.args[0]}"}, status=400)
     except (ValueError, TypeError):
         return json(
             {"message": "Invalid parameter type. Please provide valid numbers."},
@@ -138,18 +237,19 @@ async def takeoff_collision_risk(request):
             example: "2025-10-04T12:00:00"
         - name: launch_radius_meters
           in: query
-          description: Радиус (в метрах) цилиндрического коридора запуска для обнаружения объектов.
+          description: Радиус (в метрах) цилиндрического коридора запуска для обнаружения объектов, больше 0.
           required: false
           schema:
             type: string
             example: "50000"
         - name: H_ascent
           in: query
-          description: Высота (км), на которой заканчивается активный участок полета ракеты.
+          description: Высота (км), на которой заканчивается активный участок полета ракеты, больше 0.
           required: true
           schema:
             type: number
             format: float
+            exclusiveMinimum: 0
             example: 200.5
         - name: V_rel
           in: query
@@ -169,11 +269,13 @@ async def takeoff_collision_risk(request):
             example: 15.8
         - name: T_seconds
           in: query
-          description: Продолжительность (секунды) активного участка полета.
+          description: Продолжительность (секунды) активного участка полета, не более 3600.
           required: true
           schema:
             type: number
             format: float
+            minimum: 0
+            maximum: 3600
             example: 540.0
         - name: C_total_loss
           in: query
@@ -185,31 +287,23 @@ async def takeoff_collision_risk(request):
             example: 50000000
     """
     try:
-        h_ascent = float(request.args["H_ascent"][0])
-        a_rocket = float(request.args["A_rocket"][0])
-        t_seconds = float(request.args["T_seconds"][0])
-        c_total_loss = float(request.args["C_total_loss"][0])
-        lat = float(request.args["lat"][0])
-        lon = float(request.args["lon"][0])
-        date_str = request.args["date"][0]
-
-        launch_cylinder_radius_m = int(request.args.get("launch_radius_meters", ["50000"])[0])
-
-        v_rel = float(request.args.get("V_rel", [12.5])[0])
-
-        _, filtered_satellites = calculate_orbit_congestion_by_altitude(
-            get_all_trackable_objects(), 0, h_ascent, 0, 180
+        params = _parse_params(TakeoffRiskParams, request.args)
+    except ValidationError as e:
+        return _validation_error(
+            e, "Invalid or missing parameter type. Please provide valid numbers."
         )
 
-        launch_date = None
-        for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
-            try:
-                launch_date = datetime.strptime(date_str, fmt)
-                break
-            except ValueError:
-                continue
+    try:
+        h_ascent = params.H_ascent
+        t_seconds = params.T_seconds
+        lat = params.lat
+        lon = params.lon
+        date_str = params.date
+        launch_cylinder_radius_m = params.launch_radius_meters
 
-        if launch_date is None:
+        try:
+            launch_date = datetime.fromisoformat(date_str)
+        except ValueError:
             return json(
                 {"message": f"Invalid date format for '{date_str}'. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS."},
                 status=400,
@@ -218,30 +312,32 @@ async def takeoff_collision_risk(request):
         if launch_date.tzinfo is None:
             launch_date = launch_date.replace(tzinfo=timezone.utc)
 
-        dangerous_satellite_ids = set()
         time_step_seconds = 60
+        sample_times = [
+            launch_date + timedelta(seconds=time_offset)
+            for time_offset in range(0, int(t_seconds) + 1, time_step_seconds)
+        ]
 
-        for time_offset in range(0, int(t_seconds) + 1, time_step_seconds):
-            current_time = launch_date + timedelta(seconds=time_offset)
-            for sat_data in filtered_satellites:
-                try:
-                    position = calculate_satellite_position(sat_data, current_time)
-                    distance_m = quick_distance(position["lat"], position["lon"], lat, lon)
-                    if distance_m < launch_cylinder_radius_m:
-                        dangerous_satellite_ids.add(sat_data.get("number"))
-                except Exception:
-                    continue
-
-        N_objects = len(dangerous_satellite_ids)
+        all_objects = await get_all_trackable_objects()
+        N_objects = await asyncio.get_running_loop().run_in_executor(
+            request.app.ctx.pool,
+            _count_objects_in_corridor,
+            all_objects,
+            h_ascent,
+            sample_times,
+            lat,
+            lon,
+            launch_cylinder_radius_m,
+        )
 
         takeoff_risk_data = calculate_launch_collision_risk(
             N_objects,
             h_ascent,
             launch_cylinder_radius_m,
-            v_rel,
-            a_rocket,
+            params.V_rel,
+            params.A_rocket,
             t_seconds,
-            c_total_loss,
+            params.C_total_loss,
         )
 
         takeoff_risk_data['objects_in_corridor'] = N_objects
@@ -249,8 +345,6 @@ async def takeoff_collision_risk(request):
 
         return json(takeoff_risk_data)
 
-    except KeyError as e:
-        return json({"message": f"Missing required parameter: {e.args[0]}"}, status=400)
     except (ValueError, TypeError, AttributeError) as e:
         return json(
             {"message": f"Invalid or missing parameter type. Please provide valid numbers. Error: {e}"},
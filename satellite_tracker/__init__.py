@@ -1,11 +1,31 @@
-from .tle_importer import get_all_trackable_objects
-from .orbit import calculate_orbit_congestion_by_altitude
-from .calculate_position import calculate_satellite_position
+from ._kernels import warm_up_kernels
+from ._http import open_http_session, close_http_session
+from .catalog import TLECatalog
+from .tle_importer import (
+    get_all_trackable_objects,
+    get_all_trackable_objects_sync,
+    refresh_trackable_objects,
+)
+from .orbit import (
+    calculate_orbit_congestion_by_altitude,
+    count_satellites_in_altitude_band,
+    filter_satellites_in_altitude_band,
+)
+from .calculate_position import calculate_satellite_position, calculate_positions_batch
 from .find_debris import get_debris_filtered_satcat_final
 
 __all__ = [
+    "TLECatalog",
     "get_all_trackable_objects",
+    "get_all_trackable_objects_sync",
+    "refresh_trackable_objects",
     "calculate_orbit_congestion_by_altitude",
+    "count_satellites_in_altitude_band",
+    "filter_satellites_in_altitude_band",
     "calculate_satellite_position",
+    "calculate_positions_batch",
     "get_debris_filtered_satcat_final",
+    "open_http_session",
+    "close_http_session",
+    "warm_up_kernels",
 ]
@@ -0,0 +1,8 @@
+from typing import Optional
+
+from .catalog import TLECatalog
+
+# Текущий снимок каталога отслеживаемых объектов.
+# Обновляется фоновой задачей целиком (заменой ссылки), поэтому обработчики
+# запросов всегда видят согласованный набор данных без блокировок.
+SATS: Optional[TLECatalog] = None
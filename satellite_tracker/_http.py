@@ -0,0 +1,36 @@
+from typing import Optional
+
+import aiohttp
+
+HTTP_TIMEOUT_SECONDS = 90
+USER_AGENT = "Orbiteer/1.0 (satellite-tracker)"
+
+# Общая сессия с пулом соединений для всех запросов к внешним сервисам.
+# Открывается при старте сервера и закрывается при его остановке.
+SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def _new_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
+async def open_http_session() -> None:
+    """
+    Создает общую HTTP-сессию, если она еще не открыта.
+    """
+    global SESSION
+    if SESSION is None or SESSION.closed:
+        SESSION = _new_session()
+
+
+async def close_http_session() -> None:
+    """
+    Закрывает общую HTTP-сессию.
+    """
+    global SESSION
+    if SESSION is not None:
+        await SESSION.close()
+        SESSION = None
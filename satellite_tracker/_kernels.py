@@ -0,0 +1,88 @@
+import numpy as np
+from numba import njit
+
+# Сетка агрегации: среднее движение 0-20 об/сут с шагом 0.1 и наклонение 0-180° с шагом 1°.
+MEAN_MOTION_BINS = 201
+INCLINATION_BINS = 181
+N_CELLS = MEAN_MOTION_BINS * INCLINATION_BINS
+
+# Запись ячейки: все накопители одной ячейки лежат рядом в памяти,
+# поэтому обновление ячейки затрагивает одну строку кэша, а не три массива.
+CELL_DTYPE = np.dtype(
+    [("count", np.int64), ("sum_inc", np.float64), ("sum_mm", np.float64)]
+)
+
+# fastmath без флагов nnan/ninf: некорректные поля TLE приходят как NaN
+# и должны отсеиваться сравнениями.
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _aggregate(mm, incl, mm_lo, mm_hi, inc_lo, inc_hi):
+    """
+    Фильтрует объекты по среднему движению и наклонению и агрегирует их
+    в массив записей CELL_DTYPE с плоским индексом mm_bin * INCLINATION_BINS + incl_bin.
+
+    Возвращает маску прошедших фильтр объектов и массив ячеек с количеством объектов,
+    суммой наклонений и суммой средних движений.
+    """
+    n = mm.shape[0]
+    mask = np.zeros(n, np.bool_)
+    cells = np.zeros(N_CELLS, CELL_DTYPE)
+
+    for i in range(n):
+        m = mm[i]
+        inc = incl[i]
+        if not (mm_lo <= m <= mm_hi):
+            continue
+        if not (inc_lo <= inc <= inc_hi):
+            continue
+
+        mm_bin = np.int64(np.rint(m * 10.0))
+        inc_bin = np.int64(np.rint(inc))
+        if mm_bin < 0 or mm_bin >= MEAN_MOTION_BINS:
+            continue
+        if inc_bin < 0 or inc_bin >= INCLINATION_BINS:
+            continue
+
+        cell = cells[mm_bin * INCLINATION_BINS + inc_bin]
+        mask[i] = True
+        cell.count += 1
+        cell.sum_inc += inc
+        cell.sum_mm += m
+
+    return mask, cells
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def band_mask(mm, incl, mm_lo, mm_hi, inc_lo, inc_hi):
+    """
+    Возвращает маску объектов, попадающих в диапазон среднего движения и наклонения.
+    """
+    return (mm >= mm_lo) & (mm <= mm_hi) & (incl >= inc_lo) & (incl <= inc_hi)
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def count_in_band(mm, incl, mm_lo, mm_hi, inc_lo, inc_hi):
+    """
+    Возвращает количество объектов, попадающих в диапазон среднего движения и наклонения.
+    """
+    return band_mask(mm, incl, mm_lo, mm_hi, inc_lo, inc_hi).sum()
+
+
+def warm_up_kernels() -> None:
+    """
+    Компилирует (или загружает из кэша на диске) Numba-ядра на фиктивных данных
+    с теми же типами, что и в рабочих вызовах, чтобы первый запрос не ждал компиляции.
+    Первый запуск после изменения кода занимает несколько секунд, последующие
+    загружают скомпилированные ядра из __pycache__.
+    """
+    from .utils import altitude_to_mean_motion
+
+    mm = np.zeros(1, np.float64)
+    incl = np.zeros(1, np.float64)
+    _aggregate(mm, incl, 0.0, 1.0, 0.0, 1.0)
+    band_mask(mm, incl, 0.0, 1.0, 0.0, 1.0)
+    count_in_band(mm, incl, 0.0, 1.0, 0.0, 1.0)
+    altitude_to_mean_motion(0)
+    altitude_to_mean_motion(0.0)
@@ -1,19 +1,28 @@
-from skyfield.api import load, EarthSatellite
+from skyfield.api import load
+from skyfield.sgp4lib import theta_GMST1982
 from skyfield.timelib import Time
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Sequence
 
-from skyfield.toposlib import wgs84
+import numpy as np
+from sgp4.api import jday
+
+from .catalog import TLECatalog
 
 # Загрузка таймскейла Skyfield
 ts = load.timescale()
 
+# Параметры эллипсоида WGS84 для перевода координат в геодезические
+WGS84_RADIUS_KM = 6378.137
+WGS84_E2 = (1.0 / 298.257223563) * (2.0 - 1.0 / 298.257223563)
+
 
 def calculate_satellite_position(
     sat_data: Dict[str, Any], target_time: datetime
 ) -> Dict[str, float]:
     """
     Рассчитывает положение спутника (широта, долгота, высота) в заданный момент времени.
+    Использует тот же векторизованный расчет, что и calculate_positions_batch.
 
     Аргументы:
     sat_data (Dict[str, Any]): Словарь с данными спутника, включая 'line1' и 'line2'.
@@ -33,44 +42,88 @@ def calculate_satellite_position(
         )
 
     try:
-        # 1. Создание объекта EarthSatellite
-        satellite = EarthSatellite(line1, line2, name, ts)
-
-        # 2. Надежная обработка часовых поясов
-        # Если время "наивное" (без tzinfo), считаем, что оно уже в UTC.
-        if target_time.tzinfo is None:
-            target_time = target_time.replace(tzinfo=timezone.utc)
-        else:
-            # Если время уже с таймзоной, приводим его к UTC для единообразия.
-            target_time = target_time.astimezone(timezone.utc)
-
-        t: Time = ts.utc(
-            target_time.year,
-            target_time.month,
-            target_time.day,
-            target_time.hour,
-            target_time.minute,
-            target_time.second + target_time.microsecond / 1_000_000.0,
+        # Одиночный расчет - частный случай пакетного: один спутник, один момент времени
+        positions = calculate_positions_batch(
+            TLECatalog.from_records([sat_data]), [target_time]
         )
-
-        # 3. Расчет геоцентрического положения (вектора)
-        geocentric = satellite.at(t)
-
-        # 4. КОРРЕКЦИЯ: Использование глобального объекта wgs84 для получения
-        # подспутниковой точки (subpoint) из геоцентрического вектора.
-        # Это самый надежный способ получить широту/долготу/высоту в Skyfield.
-        subpoint = wgs84.subpoint(geocentric)
-
-        # 5. Извлечение широты, долготы и высоты
-        lat = subpoint.latitude.degrees
-        lon = subpoint.longitude.degrees
-        alt_km = subpoint.elevation.km
-
-        return {"lat": lat, "lon": lon, "alt_km": alt_km}
-
     except ValueError as e:
         raise ValueError(
             f"Ошибка при обработке TLE или расчете положения для {name}: {e}"
         )
     except Exception as e:
         raise Exception(f"Непредвиденная ошибка: {e}")
+
+    return {
+        "lat": float(positions["lat"][0, 0]),
+        "lon": float(positions["lon"][0, 0]),
+        "alt_km": float(positions["alt_km"][0, 0]),
+    }
+
+
+def _to_utc(target_time: datetime) -> datetime:
+    if target_time.tzinfo is None:
+        return target_time.replace(tzinfo=timezone.utc)
+    return target_time.astimezone(timezone.utc)
+
+
+def calculate_positions_batch(
+    catalog: TLECatalog, target_times: Sequence[datetime]
+) -> Dict[str, np.ndarray]:
+    """
+    Рассчитывает положения группы спутников сразу для нескольких моментов времени.
+
+    Все спутники распространяются одним вызовом SatrecArray.sgp4, а переход
+    TEME -> геодезические координаты выполняется векторно через угол GMST.
+
+    Аргументы:
+    catalog (TLECatalog): Каталог спутников.
+    target_times (Sequence[datetime]): Моменты времени для расчета.
+
+    Возвращает:
+    Dict[str, np.ndarray]: Массивы 'lat', 'lon' (градусы) и 'alt_km' формы
+    (число спутников, число моментов). Для объектов, которые не удалось
+    распространить, значения равны NaN.
+    """
+    n_times = len(target_times)
+    if len(catalog) == 0 or n_times == 0:
+        empty = np.empty((len(catalog), n_times))
+        return {"lat": empty, "lon": empty.copy(), "alt_km": empty.copy()}
+
+    utc_times = [_to_utc(target_time) for target_time in target_times]
+    jd = np.empty(n_times)
+    fr = np.empty(n_times)
+    for i, t_utc in enumerate(utc_times):
+        jd[i], fr[i] = jday(
+            t_utc.year,
+            t_utc.month,
+            t_utc.day,
+            t_utc.hour,
+            t_utc.minute,
+            t_utc.second + t_utc.microsecond / 1_000_000.0,
+        )
+
+    errors, r_teme, _ = catalog.satrec_array.sgp4(jd, fr)
+    r_teme[errors != 0] = np.nan
+
+    # TEME -> PEF: поворот вокруг оси Z на угол GMST (полярное движение не учитывается)
+    t: Time = ts.from_datetimes(utc_times)
+    theta, _ = theta_GMST1982(t.whole, t.ut1_fraction)
+    cos_theta = np.cos(theta)
+    sin_theta = np.sin(theta)
+    x = cos_theta * r_teme[..., 0] + sin_theta * r_teme[..., 1]
+    y = cos_theta * r_teme[..., 1] - sin_theta * r_teme[..., 0]
+    z = r_teme[..., 2]
+
+    # Геодезическая широта и высота на эллипсоиде WGS84 (та же итерация, что в Skyfield)
+    r_xy = np.sqrt(x * x + y * y)
+    lat = np.arctan2(z, r_xy)
+    for _ in range(3):
+        sin_lat = np.sin(lat)
+        e2_sin_lat = WGS84_E2 * sin_lat
+        a_c = WGS84_RADIUS_KM / np.sqrt(1.0 - e2_sin_lat * sin_lat)
+        hyp = z + a_c * e2_sin_lat
+        lat = np.arctan2(hyp, r_xy)
+    alt_km = np.sqrt(hyp * hyp + r_xy * r_xy) - a_c
+    lon = (np.arctan2(y, x) - np.pi) % (2 * np.pi) - np.pi
+
+    return {"lat": np.degrees(lat), "lon": np.degrees(lon), "alt_km": alt_km}
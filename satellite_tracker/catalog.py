@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Dict, Any, Tuple, Union
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+
+# Длина строки TLE и позиции полей (индексация с нуля, конец не включается)
+TLE_LINE_LENGTH = 69
+# Первая строка
+SAT_NUMBER_COLUMNS = (2, 7)
+# Вторая строка
+INCLINATION_COLUMNS = (8, 16)
+MEAN_MOTION_COLUMNS = (52, 63)
+
+# Запись TLE фиксированной ширины (строка заголовка в CelesTrak не длиннее 24 символов).
+# В этом виде категории хранятся в файловом кэше и объединяются без словарей Python.
+TLE_RECORD_DTYPE = np.dtype(
+    [
+        ("number", "<u4"),
+        ("name", "S24"),
+        ("line1", f"S{TLE_LINE_LENGTH}"),
+        ("line2", f"S{TLE_LINE_LENGTH}"),
+    ]
+)
+
+
+def _parse_column(chars: np.ndarray, columns: Tuple[int, int]) -> np.ndarray:
+    """
+    Извлекает числовое поле фиксированной ширины из байтовой матрицы строк TLE
+    одним векторизованным срезом. Некорректные значения заменяются на NaN,
+    поэтому такие объекты не проходят последующую фильтрацию.
+    """
+    start, end = columns
+    field = np.ascontiguousarray(chars[:, start:end]).view(f"S{end - start}").ravel()
+
+    try:
+        return field.astype(np.float64)
+    except ValueError:
+        values = np.full(field.shape, np.nan)
+        for i, raw in enumerate(field):
+            try:
+                values[i] = float(raw)
+            except ValueError:
+                continue
+        return values
+
+
+@dataclass(frozen=True)
+class TLECatalog:
+    """
+    Каталог отслеживаемых объектов в виде параллельных массивов (Structure-of-Arrays).
+    Числовые поля TLE разбираются один раз при создании каталога.
+    """
+
+    names: np.ndarray
+    numbers: np.ndarray
+    line1: np.ndarray
+    line2: np.ndarray
+    mean_motion: np.ndarray
+    inclination: np.ndarray
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "TLECatalog":
+        """
+        Строит каталог из списка словарей спутников, пропуская объекты без строк TLE.
+        """
+        records = [
+            sat_data
+            for sat_data in records
+            if sat_data.get("line1") and sat_data.get("line2")
+        ]
+        line2s = [
+            sat_data["line2"][:TLE_LINE_LENGTH].ljust(TLE_LINE_LENGTH)
+            for sat_data in records
+        ]
+
+        buf = "".join(line2s).encode("ascii", errors="replace")
+        chars = np.frombuffer(buf, dtype="S1").reshape(-1, TLE_LINE_LENGTH)
+
+        return cls(
+            names=np.array([sat_data.get("name", "UNKNOWN") for sat_data in records], dtype=str),
+            numbers=np.array([sat_data.get("number", -1) for sat_data in records], dtype=np.int64),
+            line1=np.array([sat_data["line1"] for sat_data in records], dtype=str),
+            line2=np.array(line2s, dtype=str),
+            mean_motion=_parse_column(chars, MEAN_MOTION_COLUMNS),
+            inclination=_parse_column(chars, INCLINATION_COLUMNS),
+        )
+
+    @classmethod
+    def from_array(cls, records: np.ndarray) -> "TLECatalog":
+        """
+        Строит каталог из структурированного массива с типом TLE_RECORD_DTYPE,
+        разбирая числовые поля прямо из байтов строк без промежуточных словарей.
+        """
+        line2 = np.ascontiguousarray(records["line2"])
+        chars = line2.view("S1").reshape(-1, TLE_LINE_LENGTH)
+
+        return cls(
+            names=np.char.decode(records["name"], "ascii", "replace"),
+            numbers=records["number"].astype(np.int64),
+            line1=np.char.decode(records["line1"], "ascii", "replace"),
+            line2=np.char.decode(line2, "ascii", "replace"),
+            mean_motion=_parse_column(chars, MEAN_MOTION_COLUMNS),
+            inclination=_parse_column(chars, INCLINATION_COLUMNS),
+        )
+
+    def __len__(self) -> int:
+        return self.numbers.shape[0]
+
+    @cached_property
+    def satrecs(self) -> List[Satrec]:
+        """
+        Инициализированные модели SGP4 для всех объектов каталога.
+        Строятся один раз на каталог и переиспользуются всеми запросами.
+        """
+        return [
+            Satrec.twoline2rv(line1, line2)
+            for line1, line2 in zip(self.line1.tolist(), self.line2.tolist())
+        ]
+
+    @cached_property
+    def satrec_array(self) -> SatrecArray:
+        """
+        Модели SGP4 каталога, собранные для векторного распространения.
+        Строятся один раз и переиспользуются при расчете положений по частям.
+        """
+        return SatrecArray(self.satrecs)
+
+    @cached_property
+    def sorted_mean_motion(self) -> np.ndarray:
+        """
+        Отсортированные средние движения объектов с корректным наклонением (0-180°).
+        Строятся один раз на каталог и позволяют считать объекты в слое высот
+        двумя бинарными поисками вместо прохода по всему каталогу.
+        """
+        valid = (
+            np.isfinite(self.mean_motion)
+            & (self.inclination >= 0.0)
+            & (self.inclination <= 180.0)
+        )
+        return np.sort(self.mean_motion[valid])
+
+    def subset(self, selector: np.ndarray) -> "TLECatalog":
+        """
+        Возвращает каталог из объектов, выбранных булевой маской или массивом индексов.
+        Уже построенные модели SGP4 переносятся в новый каталог без повторной инициализации.
+        """
+        subset = TLECatalog(
+            names=self.names[selector],
+            numbers=self.numbers[selector],
+            line1=self.line1[selector],
+            line2=self.line2[selector],
+            mean_motion=self.mean_motion[selector],
+            inclination=self.inclination[selector],
+        )
+        if "satrecs" in self.__dict__:
+            indices = np.arange(len(self))[selector]
+            subset.__dict__["satrecs"] = [self.satrecs[i] for i in indices.tolist()]
+        return subset
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Преобразует каталог обратно в список словарей спутников.
+        """
+        return [
+            {"name": name, "number": number, "line1": line1, "line2": line2}
+            for name, number, line1, line2 in zip(
+                self.names.tolist(),
+                self.numbers.tolist(),
+                self.line1.tolist(),
+                self.line2.tolist(),
+            )
+        ]
+
+
+def as_catalog(tle_data: Union[TLECatalog, List[Dict[str, Any]]]) -> TLECatalog:
+    """
+    Приводит входные данные TLE к каталогу, не копируя уже готовый каталог.
+    """
+    if isinstance(tle_data, TLECatalog):
+        return tle_data
+    return TLECatalog.from_records(tle_data)
@@ -1,113 +1,126 @@
-import math
-from typing import List, Dict, Tuple, Any
+import logging
+from typing import List, Dict, Tuple, Any, Union
 
-from skyfield.api import EarthSatellite, load
+import numpy as np
 
-# Загрузка таймскейла Skyfield
-ts = load.timescale()
+from ._kernels import INCLINATION_BINS, _aggregate, band_mask, count_in_band
+from .catalog import TLECatalog, as_catalog
+from .utils import altitude_to_mean_motion
 
-# Константы, необходимые для преобразования высоты в среднее движение.
-# Они используются для фильтрации по высоте, так как TLE напрямую не содержит высоту.
-MU_KM3_PER_S2 = 398600.4418  # Стандартный гравитационный параметр Земли (км^3/с^2)
-EARTH_RADIUS_KM = 6378.137  # Средний экваториальный радиус Земли (км)
+logger = logging.getLogger(__name__)
 
 
-def _altitude_to_mean_motion(altitude_km: float) -> float:
+def count_satellites_in_altitude_band(
+    tle_data: Union[TLECatalog, List[Dict[str, Any]]],
+    min_altitude_km: float,
+    max_altitude_km: float,
+    min_inclination: float,
+    max_inclination: float,
+) -> int:
     """
-    Преобразует высоту орбиты (в предположении, что она круговая) в среднее движение.
-    Это необходимо для фильтрации спутников по диапазону высот.
+    Возвращает только количество объектов в слое высот и диапазоне наклонений,
+    без построения карты загруженности.
     """
-    if altitude_km < 0:
-        return 0.0
-
-    orbital_radius_km = EARTH_RADIUS_KM + altitude_km
-
-    try:
-        # Формула периода обращения Кеплера
-        period_seconds = 2 * math.pi * math.sqrt(orbital_radius_km**3 / MU_KM3_PER_S2)
-    except ValueError:
-        return 0.0
+    catalog = as_catalog(tle_data)
+    min_mean_motion = altitude_to_mean_motion(max_altitude_km)
+    max_mean_motion = altitude_to_mean_motion(min_altitude_km)
+
+    # Для всех наклонений достаточно отсортированных средних движений каталога
+    if min_inclination <= 0 and max_inclination >= 180:
+        sorted_mm = catalog.sorted_mean_motion
+        count = np.searchsorted(sorted_mm, max_mean_motion, side="right") - np.searchsorted(
+            sorted_mm, min_mean_motion, side="left"
+        )
+        # Пустой диапазон (например, нижняя граница слоя ниже поверхности) дает ноль
+        return max(int(count), 0)
+
+    return int(
+        count_in_band(
+            catalog.mean_motion,
+            catalog.inclination,
+            min_mean_motion,
+            max_mean_motion,
+            float(min_inclination),
+            float(max_inclination),
+        )
+    )
 
-    if period_seconds == 0:
-        return float("inf")
 
-    # Преобразование периода в количество оборотов в сутки
-    mean_motion_rev_per_day = 86400.0 / period_seconds
-    return mean_motion_rev_per_day
+def filter_satellites_in_altitude_band(
+    tle_data: Union[TLECatalog, List[Dict[str, Any]]],
+    min_altitude_km: float,
+    max_altitude_km: float,
+    min_inclination: float,
+    max_inclination: float,
+) -> TLECatalog:
+    """
+    Возвращает каталог объектов в слое высот и диапазоне наклонений,
+    без построения карты загруженности.
+    """
+    catalog = as_catalog(tle_data)
+    mask = band_mask(
+        catalog.mean_motion,
+        catalog.inclination,
+        altitude_to_mean_motion(max_altitude_km),
+        altitude_to_mean_motion(min_altitude_km),
+        float(min_inclination),
+        float(max_inclination),
+    )
+    return catalog.subset(mask)
 
 
 def calculate_orbit_congestion_by_altitude(
-    tle_data_dicts: List[Dict[str, Any]],
+    tle_data: Union[TLECatalog, List[Dict[str, Any]]],
     min_altitude_km: float,
     max_altitude_km: float,
     min_inclination: float,
     max_inclination: float,
-) -> Tuple[Dict[Tuple[float, int], Dict[str, Any]], List[Dict[str, Any]]]:
+) -> Tuple[Dict[Tuple[float, int], Dict[str, Any]], TLECatalog]:
     """
     Рассчитывает загруженность орбитальных слоев и возвращает как карту
-    загруженности, так и отфильтрованный список спутников.
+    загруженности, так и каталог отфильтрованных спутников.
+
+    Наклонение и среднее движение берутся из массивов каталога, а фильтрация
+    и агрегация выполняются скомпилированным Numba-ядром без цикла Python
+    по каждому объекту.
     """
-    try:
-        max_mean_motion_filter = _altitude_to_mean_motion(min_altitude_km)
-        min_mean_motion_filter = _altitude_to_mean_motion(max_altitude_km)
-    except ValueError:
-        print("Ошибка: Некорректный диапазон высот.")
-        return {}, []
-
-    print(
-        f"Фильтр по среднему движению (об/сут): от {min_mean_motion_filter:.4f} до {max_mean_motion_filter:.4f}"
+    max_mean_motion_filter = altitude_to_mean_motion(min_altitude_km)
+    min_mean_motion_filter = altitude_to_mean_motion(max_altitude_km)
+
+    logger.debug(
+        "Фильтр по среднему движению (об/сут): от %.4f до %.4f",
+        min_mean_motion_filter,
+        max_mean_motion_filter,
     )
 
-    congestion_map: Dict[Tuple[float, int], Dict[str, Any]] = {}
-    filtered_satellites: List[Dict[str, Any]] = []
-
-    for sat_data in tle_data_dicts:
-        name = sat_data.get("name", "UNKNOWN")
-        line1 = sat_data.get("line1")
-        line2 = sat_data.get("line2")
-
-        if not line1 or not line2:
-            continue
-
-        try:
-            satellite = EarthSatellite(line1, line2, name, ts)
-            mean_motion = satellite.model.no_kozai * (1440.0 / (2 * math.pi))
-            inclination_deg = math.degrees(satellite.model.inclo)
-
-            if not (min_mean_motion_filter <= mean_motion <= max_mean_motion_filter):
-                continue
-            if not (min_inclination <= inclination_deg <= max_inclination):
-                continue
-
-            # Спутник прошел фильтрацию, добавляем его в список
-            filtered_satellites.append(sat_data)
-
-            # Кластеризация и агрегация
-            mean_motion_bin = round(mean_motion, 1)
-            inclination_bin = int(round(inclination_deg))
-            cell_key = (mean_motion_bin, inclination_bin)
-
-            if cell_key not in congestion_map:
-                congestion_map[cell_key] = {
-                    "count": 0,
-                    "avg_inclination": 0.0,
-                    "avg_mean_motion": 0.0,
-                }
-
-            data = congestion_map[cell_key]
-            current_count = data["count"]
-            new_count = current_count + 1
-
-            data["avg_inclination"] = (
-                data["avg_inclination"] * current_count + inclination_deg
-            ) / new_count
-            data["avg_mean_motion"] = (
-                data["avg_mean_motion"] * current_count + mean_motion
-            ) / new_count
-            data["count"] = new_count
-
-        except Exception as e:
-            print(f"Ошибка при обработке спутника {name}: {e}")
-            continue
+    catalog = as_catalog(tle_data)
+
+    mask, cells = _aggregate(
+        catalog.mean_motion,
+        catalog.inclination,
+        min_mean_motion_filter,
+        max_mean_motion_filter,
+        float(min_inclination),
+        float(max_inclination),
+    )
+    filtered_satellites = catalog.subset(mask)
+
+    # Словарь строится только для заполненных ячеек
+    populated = np.flatnonzero(cells["count"])
+    filled = cells[populated]
+    congestion_map: Dict[Tuple[float, int], Dict[str, Any]] = {
+        (mean_motion_bin / 10, inclination_bin): {
+            "count": count,
+            "avg_inclination": inc,
+            "avg_mean_motion": mm,
+        }
+        for mean_motion_bin, inclination_bin, count, inc, mm in zip(
+            (populated // INCLINATION_BINS).tolist(),
+            (populated % INCLINATION_BINS).tolist(),
+            filled["count"].tolist(),
+            (filled["sum_inc"] / filled["count"]).tolist(),
+            (filled["sum_mm"] / filled["count"]).tolist(),
+        )
+    }
 
     return congestion_map, filtered_satellites
@@ -1,84 +1,360 @@
-import requests
-import time
-import json
+import asyncio
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import tempfile
+import time
+from typing import List, Dict, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+from . import _cache, _http
+from .catalog import (
+    TLECatalog,
+    TLE_LINE_LENGTH,
+    TLE_RECORD_DTYPE,
+    SAT_NUMBER_COLUMNS,
+    _parse_column,
+)
+
+_BASE_URL = "https://celestrak.org/NORAD/elements/gp.php"
+# Категории CelesTrak в порядке объединения (при повторе объекта побеждает последняя)
+_URLS = tuple(
+    (group, f"{_BASE_URL}?GROUP={group}&FORMAT=tle")
+    for group in (
+        "active",
+        "stations",
+        "rocket-bodies",
+        "cosmos-1408-debris",
+        "iridium-33-debris",
+        "cosmos-2251-debris",
+        "fengyun-1c-debris",
+        "dmsp-f13-debris",
+        "breeze-m-debris",
+    )
+) + (
+    ("debris", f"{_BASE_URL}?GROUP=DEBRIS&FORMAT=tle"),
+    ("decaying", f"{_BASE_URL}?SPECIAL=DECAYING&FORMAT=tle"),
+)
 
-CACHE_FILE = "/tmp/tle_cache.json"
-CACHE_DURATION_HOURS = 4
+# Каталог файлового кэша можно переопределить переменной окружения TLE_CACHE_DIR
+CACHE_DIR = os.environ.get("TLE_CACHE_DIR", "/tmp/tle_cache")
+# Время жизни кэша каждой категории (секунды), согласованное с частотой обновления
+# данных на CelesTrak: активные спутники меняются часто, облака обломков - редко.
+CACHE_TTLS = {
+    "active": 7200,
+    "stations": 7200,
+    "rocket-bodies": 86400,
+    "cosmos-1408-debris": 86400,
+    "iridium-33-debris": 86400,
+    "cosmos-2251-debris": 86400,
+    "fengyun-1c-debris": 86400,
+    "dmsp-f13-debris": 86400,
+    "breeze-m-debris": 86400,
+    "debris": 86400,
+    "decaying": 3600,
+}
+# Период фонового обновления: по самой короткоживущей категории
+REFRESH_INTERVAL_SECONDS = min(CACHE_TTLS.values())
+# Число одновременных загрузок категорий с CelesTrak
+MAX_PARALLEL_DOWNLOADS = 6
 
-def get_all_trackable_objects() -> List[Dict[str, Any]]:
+# Заголовок файла кэша категории: время загрузки (POSIX-секунды) и валидаторы
+# ответа CelesTrak; за ним подряд идут записи TLE_RECORD_DTYPE
+CACHE_HEADER_DTYPE = np.dtype(
+    [("fetched_at", "<f8"), ("etag", "S128"), ("last_modified", "S40")]
+)
+
+async def get_all_trackable_objects() -> TLECatalog:
     """
-    Загружает и парсит TLE-данные для всех отслеживаемых объектов,
-    используя файловый кэш для уменьшения количества запросов.
-    """
-    # Проверка кэша
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, 'r') as f:
-            try:
-                cache_data = json.load(f)
-                last_fetched_time = datetime.fromisoformat(cache_data["timestamp"])
-                if datetime.utcnow() - last_fetched_time < timedelta(hours=CACHE_DURATION_HOURS):
-                    print("CACHE HIT: Загрузка данных из кэша.")
-                    return cache_data["data"]
-            except (json.JSONDecodeError, KeyError, ValueError):
-                print("CACHE ERROR: Ошибка чтения кэша. Будут загружены свежие данные.")
-
-    # Если кэш недействителен или отсутствует, загружаем данные из сети
-    print("CACHE MISS: Кэш недействителен или отсутствует. Загрузка свежих данных с CelesTrak.")
-
-    base_url = "https://celestrak.org/NORAD/elements/gp.php"
-    urls = {
-        "active": f"{base_url}?GROUP=active&FORMAT=tle",
-        "stations": f"{base_url}?GROUP=stations&FORMAT=tle",
-        "rocket-bodies": f"{base_url}?GROUP=rocket-bodies&FORMAT=tle",
-        "cosmos-1408-debris": f"{base_url}?GROUP=cosmos-1408-debris&FORMAT=tle",
-        "iridium-33-debris": f"{base_url}?GROUP=iridium-33-debris&FORMAT=tle",
-        "cosmos-2251-debris": f"{base_url}?GROUP=cosmos-2251-debris&FORMAT=tle",
-        "fengyun-1c-debris": f"{base_url}?GROUP=fengyun-1c-debris&FORMAT=tle",
-        "dmsp-f13-debris": f"{base_url}?GROUP=dmsp-f13-debris&FORMAT=tle",
-        "breeze-m-debris": f"{base_url}?GROUP=breeze-m-debris&FORMAT=tle",
-        "debris": f"{base_url}?GROUP=DEBRIS&FORMAT=tle",
-        "decaying": f"{base_url}?SPECIAL=DECAYING&FORMAT=tle",
-    }
-
-    unique_objects: Dict[int, Dict[str, Any]] = {}
-
-    for category, url in urls.items():
-        print(f"Загрузка данных из категории '{category}' с {url}...")
-        time.sleep(1)
+    Возвращает каталог отслеживаемых объектов из памяти процесса.
+    Если каталог еще не загружен фоновой задачей, загружает его.
+    """
+    sats = _cache.SATS
+    if sats is None:
+        sats = await refresh_trackable_objects()
+    return sats
+
+
+def get_all_trackable_objects_sync() -> TLECatalog:
+    """
+    Синхронная обертка над get_all_trackable_objects для скриптов и отчетов,
+    запускаемых вне цикла событий.
+    """
+    return asyncio.run(get_all_trackable_objects())
+
+
+def _build_catalog(records: np.ndarray) -> TLECatalog:
+    """
+    Строит каталог из записей TLE вместе с индексом для подсчета объектов в слое
+    и объектами Satrec для SGP4: первый запрос не платит за их построение,
+    а потоки пула не строят одно и то же кешируемое свойство наперегонки.
+    """
+    sats = TLECatalog.from_array(records)
+    sats.sorted_mean_motion
+    sats.satrecs
+    return sats
+
+
+async def refresh_trackable_objects() -> TLECatalog:
+    """
+    Загружает свежий каталог, один раз разбирает числовые поля TLE
+    и атомарно заменяет им снимок в памяти.
+    """
+    records = await fetch_all_trackable_objects()
+    # Построение каталога выполняется в потоке, чтобы не блокировать цикл событий
+    sats = await asyncio.to_thread(_build_catalog, records)
+    _cache.SATS = sats
+    return sats
+
+
+def _checksum_ok(chars: np.ndarray) -> np.ndarray:
+    """
+    Векторно проверяет контрольные суммы строк TLE, заданных байтовой матрицей (N, 69):
+    сумма цифр первых 68 символов плюс 1 за каждый минус по модулю 10
+    должна совпадать с цифрой в последней колонке.
+    """
+    codes = chars.view(np.uint8)
+    body = codes[:, :-1]
+    digits = body - np.uint8(ord("0"))
+    weights = np.where(digits < 10, digits, 0) + (body == ord("-"))
+    expected = codes[:, -1].astype(np.int64) - ord("0")
+    return weights.sum(axis=1, dtype=np.int64) % 10 == expected
+
+
+def _parse_tle_records(
+    names: List[bytes], line1s: List[bytes], line2s: List[bytes]
+) -> np.ndarray:
+    """
+    Проверяет и разбирает тройки строк TLE (байты без перевода строки) одной категории
+    за один векторизованный проход в структурированный массив TLE_RECORD_DTYPE.
+    Записи с неверной длиной строк, некорректным номером объекта или неверной
+    контрольной суммой отбрасываются.
+    """
+    valid = np.fromiter(
+        (
+            len(line1) == TLE_LINE_LENGTH and len(line2) == TLE_LINE_LENGTH
+            for line1, line2 in zip(line1s, line2s)
+        ),
+        dtype=bool,
+        count=len(line1s),
+    )
+    indices = np.flatnonzero(valid).tolist()
+
+    line_dtype = f"S{TLE_LINE_LENGTH}"
+    chars = np.frombuffer(b"".join(line1s[i] for i in indices), dtype="S1")
+    chars = chars.reshape(-1, TLE_LINE_LENGTH)
+    chars2 = np.frombuffer(b"".join(line2s[i] for i in indices), dtype="S1")
+    chars2 = chars2.reshape(-1, TLE_LINE_LENGTH)
+    start, end = SAT_NUMBER_COLUMNS
+    digits = chars[:, start:end]
+    # Номер объекта допускает только цифры и пробелы (формат Alpha-5 не поддерживается)
+    accepted = np.all(((digits >= b"0") & (digits <= b"9")) | (digits == b" "), axis=1)
+    sat_nums = _parse_column(chars, SAT_NUMBER_COLUMNS)
+    accepted &= np.isfinite(sat_nums)
+    # Поврежденные при передаче строки отбрасываются по контрольной сумме
+    accepted &= _checksum_ok(chars) & _checksum_ok(chars2)
+
+    records = np.empty(len(indices), dtype=TLE_RECORD_DTYPE)
+    records["number"] = np.where(accepted, sat_nums, 0)
+    records["name"] = [names[i] for i in indices]
+    records["line1"] = chars.view(line_dtype).ravel()
+    records["line2"] = chars2.view(line_dtype).ravel()
+    return records[accepted]
+
+
+def _group_cache_path(category: str) -> str:
+    return os.path.join(CACHE_DIR, f"{category}.bin")
 
+
+def _load_group(category: str) -> Optional[Tuple[np.void, np.ndarray]]:
+    """
+    Возвращает заголовок и записи категории из файлового кэша (записи отображаются
+    в память) или None, если кэша нет или он поврежден. Срок жизни не проверяется.
+    """
+    path = _group_cache_path(category)
+    if not os.path.exists(path):
+        return None
+
+    header_size = CACHE_HEADER_DTYPE.itemsize
+    payload_size = os.path.getsize(path) - header_size
+    if payload_size < 0 or payload_size % TLE_RECORD_DTYPE.itemsize:
+        print(f"CACHE ERROR: Ошибка чтения кэша категории '{category}'.")
+        return None
+
+    header = np.fromfile(path, dtype=CACHE_HEADER_DTYPE, count=1)[0]
+    if payload_size == 0:
+        return header, np.empty(0, dtype=TLE_RECORD_DTYPE)
+    return header, np.memmap(path, dtype=TLE_RECORD_DTYPE, mode="r", offset=header_size)
+
+
+def _is_fresh(category: str, header: np.void) -> bool:
+    return time.time() - header["fetched_at"] < CACHE_TTLS[category]
+
+
+def _save_group(
+    category: str, records: np.ndarray, etag: str = "", last_modified: str = ""
+) -> None:
+    """
+    Атомарно записывает записи категории в файловый кэш вместе с валидаторами
+    ответа CelesTrak (ETag, Last-Modified) для условных запросов.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _group_cache_path(category)
+    header = np.array(
+        [
+            (
+                time.time(),
+                etag.encode("ascii", errors="replace"),
+                last_modified.encode("ascii", errors="replace"),
+            )
+        ],
+        dtype=CACHE_HEADER_DTYPE,
+    )
+    # Уникальный временный файл: кэш могут одновременно писать несколько
+    # воркеров Sanic и сторонние скрипты
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f".{category}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            header.tofile(f)
+            records.tofile(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+async def _fetch_category(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    category: str,
+    url: str,
+    cached: Optional[Tuple[np.void, np.ndarray]] = None,
+) -> Optional[Tuple[np.ndarray, str, str]]:
+    """
+    Загружает и разбирает одну категорию CelesTrak. Если есть кэш, запрос делается
+    условным: при ответе 304 возвращаются закэшированные записи без разбора.
+    Возвращает записи и валидаторы ответа (ETag, Last-Modified).
+    При ошибке запроса возвращает None, не прерывая загрузку остальных категорий.
+    """
+    names: List[bytes] = []
+    line1s: List[bytes] = []
+    line2s: List[bytes] = []
+    lines: List[bytes] = []
+
+    headers = {}
+    if cached is not None:
+        cached_header = cached[0]
+        if cached_header["etag"]:
+            headers["If-None-Match"] = cached_header["etag"].decode("ascii")
+        if cached_header["last_modified"]:
+            headers["If-Modified-Since"] = cached_header["last_modified"].decode("ascii")
+
+    async with semaphore:
+        print(f"Загрузка данных из категории '{category}' с {url}...")
         try:
-            response = requests.get(url, timeout=90)
-            response.raise_for_status()
-            lines = response.text.strip().splitlines()
-            print(f"Получено {len(lines) // 3} объектов из '{category}'.")
-
-            for i in range(0, len(lines), 3):
-                try:
-                    name = lines[i].strip()
-                    line1 = lines[i + 1].strip()
-                    line2 = lines[i + 2].strip()
-                    if len(line1) != 69 or len(line2) != 69:
+            async with session.get(url, headers=headers) as response:
+                etag = response.headers.get("ETag", "")
+                last_modified = response.headers.get("Last-Modified", "")
+                if response.status == 304 and cached is not None:
+                    print(f"Категория '{category}' не изменилась.")
+                    return (
+                        cached[1],
+                        etag or headers.get("If-None-Match", ""),
+                        last_modified or headers.get("If-Modified-Since", ""),
+                    )
+
+                response.raise_for_status()
+                # Строки собираются по мере поступления, без буферизации всего ответа.
+                # Они остаются байтами: декодирование не нужно до построения каталога,
+                # а от строки достаточно отрезать хвост (пробелы заголовка и \r\n)
+                async for raw_line in response.content:
+                    line = raw_line.rstrip()
+                    if not line:
+                        continue
+                    lines.append(line)
+                    if len(lines) < 3:
                         continue
-                    sat_num = int(line1[2:7])
-                    unique_objects[sat_num] = {"name": name, "number": sat_num, "line1": line1, "line2": line2}
-                except (IndexError, ValueError):
-                    continue
-        except requests.exceptions.RequestException as e:
+
+                    names.append(lines[0])
+                    line1s.append(lines[1])
+                    line2s.append(lines[2])
+                    lines.clear()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"Произошла ошибка при запросе {url}: {e}")
-            continue
+            return None
+
+    print(f"Получено {len(names)} объектов из '{category}'.")
+    return _parse_tle_records(names, line1s, line2s), etag, last_modified
+
+
+async def fetch_all_trackable_objects() -> np.ndarray:
+    """
+    Загружает и парсит TLE-данные для всех отслеживаемых объектов,
+    используя файловый кэш с отдельным сроком жизни для каждой категории.
+    Из сети асинхронно загружаются только категории с устаревшим кэшем.
+    Возвращает структурированный массив TLE_RECORD_DTYPE без повторов объектов.
+    """
+    groups: Dict[str, np.ndarray] = {}
+    cached_groups: Dict[str, Tuple[np.void, np.ndarray]] = {}
+    stale: Dict[str, str] = {}
+    for category, url in _URLS:
+        cached = _load_group(category)
+        if cached is not None:
+            cached_groups[category] = cached
+        if cached is not None and _is_fresh(category, cached[0]):
+            groups[category] = cached[1]
+        else:
+            stale[category] = url
+
+    if stale:
+        print(f"CACHE MISS: Загрузка свежих данных с CelesTrak для категорий: {', '.join(stale)}.")
+
+        # Вне сервера (скрипты, отчеты) общая сессия может быть не открыта
+        session = _http.SESSION
+        owns_session = session is None or session.closed
+        if owns_session:
+            session = _http._new_session()
+
+        try:
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_DOWNLOADS)
+            results = await asyncio.gather(
+                *(
+                    _fetch_category(
+                        session, semaphore, category, url, cached_groups.get(category)
+                    )
+                    for category, url in stale.items()
+                )
+            )
+        finally:
+            if owns_session:
+                await session.close()
+
+        fetched: Dict[str, Tuple[np.ndarray, str, str]] = {}
+        for category, result in zip(stale, results):
+            if result is not None:
+                fetched[category] = result
+                groups[category] = result[0]
+            elif category in cached_groups:
+                # Сеть недоступна: лучше устаревшие данные категории, чем никаких
+                groups[category] = cached_groups[category][1]
+            else:
+                groups[category] = np.empty(0, dtype=TLE_RECORD_DTYPE)
 
-    object_list = list(unique_objects.values())
+        # Запись на диск выполняется в потоках, чтобы не блокировать цикл событий.
+        # Неизмененные (304) категории перезаписываются с новым временем загрузки
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(_save_group, category, *result)
+                for category, result in fetched.items()
+            )
+        )
+    else:
+        print("CACHE HIT: Загрузка данных из кэша.")
 
-    # Сохранение данных в кэш
-    with open(CACHE_FILE, 'w') as f:
-        cache_content = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "data": object_list
-        }
-        json.dump(cache_content, f)
+    # Объединение в порядке категорий: при повторе объекта побеждает последняя запись
+    merged = np.concatenate([groups[category] for category, _ in _URLS])
+    _, last_indices = np.unique(merged["number"][::-1], return_index=True)
+    object_array = merged[len(merged) - 1 - last_indices]
 
-    print(f"Загрузка завершена. Всего уникальных объектов: {len(object_list)}. Кэш обновлен.")
-    return object_list
+    print(f"Загрузка завершена. Всего уникальных объектов: {len(object_array)}.")
+    return object_array
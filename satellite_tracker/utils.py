@@ -0,0 +1,22 @@
+import math
+
+from numba import njit
+
+# Константы, необходимые для преобразования высоты в среднее движение.
+# Они используются для фильтрации по высоте, так как TLE напрямую не содержит высоту.
+MU_KM3_PER_S2 = 398600.4418  # Стандартный гравитационный параметр Земли (км^3/с^2)
+EARTH_RADIUS_KM = 6378.137  # Средний экваториальный радиус Земли (км)
+
+# Свернутая константа третьего закона Кеплера: n [об/сут] = _K * r^-1.5 (r в км)
+_K = 86400.0 / (2 * math.pi) * math.sqrt(MU_KM3_PER_S2)
+
+
+@njit(cache=True)
+def altitude_to_mean_motion(altitude_km):
+    """
+    Преобразует высоту орбиты (в предположении, что она круговая) в среднее движение (об/сут).
+    Это необходимо для фильтрации спутников по диапазону высот.
+    """
+    if altitude_km < 0:
+        return 0.0
+    return _K * (EARTH_RADIUS_KM + altitude_km) ** -1.5
@@ -0,0 +1,35 @@
+import sys
+
+import pytest
+
+from tle_samples import ISS_LINE1, ISS_LINE2, ISS_NAME, ROOT
+
+sys.path.insert(0, ROOT)
+
+from satellite_tracker import tle_importer  # noqa: E402
+
+
+@pytest.fixture
+def iss_records():
+    return tle_importer._parse_tle_records([ISS_NAME], [ISS_LINE1], [ISS_LINE2])
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """
+    Пустой каталог файлового кэша TLE, подключенный к tle_importer.
+    """
+    path = tmp_path / "tle_cache"
+    monkeypatch.setattr(tle_importer, "CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def seeded_cache(cache_dir, iss_records):
+    """
+    Свежий кэш всех категорий: МКС в 'active', остальные категории пустые.
+    """
+    empty = iss_records[:0]
+    for category, _ in tle_importer._URLS:
+        tle_importer._save_group(category, iss_records if category == "active" else empty)
+    return cache_dir
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from skyfield.api import EarthSatellite
+from skyfield.toposlib import wgs84
+
+from tle_samples import ISS_LINE1, ISS_LINE2, ISS_NAME
+from satellite_tracker.calculate_position import calculate_satellite_position, ts
+
+EPOCH = datetime(2008, 9, 20, 12, 25, 40, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("offset", [timedelta(0), timedelta(minutes=47), timedelta(days=1, hours=3)])
+def test_position_matches_skyfield(offset):
+    target_time = EPOCH + offset
+    sat_data = {
+        "name": ISS_NAME.decode(),
+        "line1": ISS_LINE1.decode(),
+        "line2": ISS_LINE2.decode(),
+    }
+
+    position = calculate_satellite_position(sat_data, target_time)
+
+    satellite = EarthSatellite(sat_data["line1"], sat_data["line2"], sat_data["name"], ts)
+    subpoint = wgs84.subpoint(satellite.at(ts.from_datetime(target_time)))
+    assert position["lat"] == pytest.approx(subpoint.latitude.degrees, abs=1e-9)
+    assert position["lon"] == pytest.approx(subpoint.longitude.degrees, abs=1e-9)
+    assert position["alt_km"] == pytest.approx(subpoint.elevation.km, abs=1e-6)
@@ -0,0 +1,118 @@
+import math
+
+import numpy as np
+import pytest
+
+from tle_samples import ISS_LINE1, ISS_LINE2
+from satellite_tracker import (
+    TLECatalog,
+    calculate_orbit_congestion_by_altitude,
+    count_satellites_in_altitude_band,
+    filter_satellites_in_altitude_band,
+)
+
+MU_KM3_PER_S2 = 398600.4418
+EARTH_RADIUS_KM = 6378.137
+
+
+def _synthetic_records(n_objects, seed=7):
+    """
+    Синтетические TLE на основе МКС со случайными наклонением и средним движением.
+    """
+    rng = np.random.default_rng(seed)
+    line1 = ISS_LINE1.decode()
+    line2 = ISS_LINE2.decode()
+    records = []
+    for number in range(1, n_objects + 1):
+        inclination = rng.uniform(0, 180)
+        mean_motion = rng.uniform(0.9, 16.5)
+        records.append(
+            {
+                "name": f"SAT {number}",
+                "number": number,
+                "line1": line1,
+                "line2": f"{line2[:8]}{inclination:8.4f}{line2[16:52]}{mean_motion:11.8f}{line2[63:]}",
+            }
+        )
+    return records
+
+
+def _reference_mean_motion(altitude_km):
+    if altitude_km < 0:
+        return 0.0
+    period_seconds = 2 * math.pi * math.sqrt((EARTH_RADIUS_KM + altitude_km) ** 3 / MU_KM3_PER_S2)
+    return 86400.0 / period_seconds
+
+
+def _reference_congestion(records, min_altitude_km, max_altitude_km, min_inclination, max_inclination):
+    """
+    Построчный расчет загруженности по исходному алгоритму, без NumPy и Numba.
+    """
+    max_mean_motion = _reference_mean_motion(min_altitude_km)
+    min_mean_motion = _reference_mean_motion(max_altitude_km)
+    cells = {}
+    numbers = []
+    for sat_data in records:
+        inclination = float(sat_data["line2"][8:16])
+        mean_motion = float(sat_data["line2"][52:63])
+        if not (min_mean_motion <= mean_motion <= max_mean_motion):
+            continue
+        if not (min_inclination <= inclination <= max_inclination):
+            continue
+        numbers.append(sat_data["number"])
+        cell = cells.setdefault(
+            (round(mean_motion, 1), int(round(inclination))), [0, 0.0, 0.0]
+        )
+        cell[0] += 1
+        cell[1] += inclination
+        cell[2] += mean_motion
+    return cells, numbers
+
+
+RECORDS = _synthetic_records(2000)
+
+BANDS = [
+    (0, 2000, 0, 180),
+    (300, 800, 50, 100),
+    (500, 36000, 0, 180),
+    (-100, 800, 0, 180),
+    (-100, 800, 30, 60),
+    (800, 300, 0, 180),
+]
+
+
+@pytest.mark.parametrize("band", BANDS)
+def test_congestion_matches_reference(band):
+    expected_cells, expected_numbers = _reference_congestion(RECORDS, *band)
+
+    congestion_map, filtered = calculate_orbit_congestion_by_altitude(
+        TLECatalog.from_records(RECORDS), *band
+    )
+
+    assert congestion_map.keys() == expected_cells.keys()
+    for key, (count, sum_inclination, sum_mean_motion) in expected_cells.items():
+        assert congestion_map[key]["count"] == count
+        assert congestion_map[key]["avg_inclination"] == pytest.approx(sum_inclination / count)
+        assert congestion_map[key]["avg_mean_motion"] == pytest.approx(sum_mean_motion / count)
+    assert filtered.numbers.tolist() == expected_numbers
+
+
+@pytest.mark.parametrize("band", BANDS)
+def test_band_count_and_filter_match_reference(band):
+    _, expected_numbers = _reference_congestion(RECORDS, *band)
+    catalog = TLECatalog.from_records(RECORDS)
+
+    assert count_satellites_in_altitude_band(catalog, *band) == len(expected_numbers)
+    assert filter_satellites_in_altitude_band(catalog, *band).numbers.tolist() == expected_numbers
+
+
+@pytest.mark.parametrize("band", BANDS)
+def test_empty_catalog(band):
+    catalog = TLECatalog.from_records([])
+
+    congestion_map, filtered = calculate_orbit_congestion_by_altitude(catalog, *band)
+
+    assert congestion_map == {}
+    assert len(filtered) == 0
+    assert count_satellites_in_altitude_band(catalog, *band) == 0
+    assert len(filter_satellites_in_altitude_band(catalog, *band)) == 0
@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils.risk_calculator import (
+    RISK_CLASS_THRESHOLDS,
+    assign_risk_class,
+    assign_risk_classes,
+    calculate_collision_financial_risk,
+    calculate_collision_financial_risk_batch,
+    calculate_launch_collision_risk,
+    calculate_launch_collision_risk_batch,
+)
+
+# Вероятности на порогах классов, рядом с ними, на краях диапазона и NaN
+PROBABILITIES = [0.0, math.nan, 1.0] + [
+    p * factor for p in RISK_CLASS_THRESHOLDS for factor in (0.5, 1.0, 1.0 + 1e-9, 2.0)
+]
+# Число объектов от пустого слоя до значений, дающих вероятность около 1
+N_OBJECTS = np.concatenate([[0.0, math.nan], np.geomspace(1e-3, 1e6, 64)])
+
+
+def _assert_matches_scalar(batch, scalar_results):
+    for i, scalar in enumerate(scalar_results):
+        assert batch["risk_class"][i] == scalar["risk_class"]
+        np.testing.assert_allclose(
+            batch["collision_risk"][i], scalar["collision_risk"], rtol=1e-12, equal_nan=True
+        )
+        for key in ("financial_risk", "insurance_premium"):
+            np.testing.assert_allclose(batch[key][i], scalar[key], atol=0.01, equal_nan=True)
+
+
+def test_assign_risk_classes_matches_scalar():
+    expected = [assign_risk_class(p) for p in PROBABILITIES]
+
+    assert assign_risk_classes(np.array(PROBABILITIES)).tolist() == expected
+    assert assign_risk_class(math.nan) == "A+ (Minimal)"
+
+
+def test_collision_financial_risk_batch_matches_scalar():
+    args = (550 + 50, 550 - 50, 12.5, 1.5, 5, 5e7, 1e8)
+
+    batch = calculate_collision_financial_risk_batch(N_OBJECTS, *args)
+
+    _assert_matches_scalar(
+        batch, [calculate_collision_financial_risk(n, *args) for n in N_OBJECTS]
+    )
+    assert set(batch["risk_class"].tolist()) >= {"A+ (Minimal)", "F (Extremely High)"}
+
+
+def test_launch_collision_risk_batch_matches_scalar():
+    args = (400, 50000, 12.5, 15.8, 540, 5e7)
+
+    batch = calculate_launch_collision_risk_batch(N_OBJECTS, *args)
+
+    _assert_matches_scalar(batch, [calculate_launch_collision_risk(n, *args) for n in N_OBJECTS])
+    assert set(batch["risk_class"].tolist()) >= {"A+ (Minimal)", "F (Extremely High)"}
+
+
+@pytest.mark.parametrize(
+    "batch_function, args",
+    [
+        (calculate_collision_financial_risk_batch, (10, 500, 500, 12.5, 1.5, 5, 5e7, 1e8)),
+        (calculate_launch_collision_risk_batch, (10, 0, 50000, 12.5, 15.8, 540, 5e7)),
+    ],
+)
+def test_batch_rejects_degenerate_volume(batch_function, args):
+    with pytest.raises(ValueError):
+        batch_function(*args)
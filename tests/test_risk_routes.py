@@ -0,0 +1,47 @@
+import pytest
+
+from api import create_app
+
+TAKEOFF_URL = (
+    "/api/takeoff_risk?lat=45.96&lon=63.30&date=2008-09-20T12:00:00"
+    "&A_rocket=15.8&C_total_loss=50000000"
+)
+
+
+@pytest.mark.parametrize(
+    "query, parameter",
+    [
+        ("&H_ascent=0&T_seconds=540", "H_ascent"),
+        ("&H_ascent=-100&T_seconds=540", "H_ascent"),
+        ("&H_ascent=400&T_seconds=540&launch_radius_meters=0", "launch_radius_meters"),
+        ("&H_ascent=400&T_seconds=86400", "T_seconds"),
+    ],
+)
+def test_takeoff_risk_names_invalid_parameter(seeded_cache, query, parameter):
+    _, response = create_app().test_client.get(TAKEOFF_URL + query)
+
+    assert response.status == 400
+    assert response.json["message"].startswith(f"Invalid value for parameter '{parameter}'")
+
+
+@pytest.mark.parametrize(
+    "url, parameter",
+    [
+        (
+            "/api/orbit_risk?height=nan&A_effective=1.5&T_years=5&C_full=5e7&D_lost=1e8",
+            "height",
+        ),
+        (
+            "/api/orbit_risk?height=550&A_effective=inf&T_years=5&C_full=5e7&D_lost=1e8",
+            "A_effective",
+        ),
+        (TAKEOFF_URL + "&H_ascent=400&T_seconds=540&V_rel=-inf", "V_rel"),
+    ],
+)
+def test_risk_routes_reject_non_finite_numbers(seeded_cache, url, parameter):
+    _, response = create_app().test_client.get(url)
+
+    assert response.status == 400
+    assert response.json["message"] == (
+        f"Invalid value for parameter '{parameter}': Input should be a finite number"
+    )
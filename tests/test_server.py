@@ -0,0 +1,92 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from tle_samples import ROOT
+
+LAUNCHER = """
+import sys
+sys.path.insert(0, {root!r})
+
+from api import create_app
+
+app = create_app()
+
+if __name__ == "__main__":
+    app.run(host="127.0.0.1", port={port})
+"""
+
+TAKEOFF_QUERY = (
+    "/api/takeoff_risk?lat=45.96&lon=63.30&date=2008-09-20T12:00:00"
+    "&H_ascent=400&A_rocket=15.8&T_seconds=540&C_total_loss=50000000"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(port: int, path: str):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=60) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+def _wait_until_up(port: int, proc: subprocess.Popen, log_path, timeout: float = 180.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise AssertionError(f"Сервер завершился:\n{log_path.read_text()}")
+        try:
+            if _get(port, "/api/health")[0] == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise AssertionError("Сервер не запустился")
+
+
+def test_takeoff_risk_on_real_server(seeded_cache, tmp_path):
+    """
+    Сервер запускается через app.run, как run_api.py: воркеры Sanic - процессы-демоны,
+    поэтому расчет коридора не должен порождать дочерние процессы.
+    """
+    port = _free_port()
+    launcher = tmp_path / "launch_api.py"
+    launcher.write_text(LAUNCHER.format(root=ROOT, port=port))
+    env = dict(os.environ, TLE_CACHE_DIR=str(seeded_cache))
+    log_path = tmp_path / "server.log"
+
+    with open(log_path, "w") as log:
+        proc = subprocess.Popen(
+            [sys.executable, str(launcher)],
+            cwd=ROOT,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    try:
+        _wait_until_up(port, proc, log_path)
+        for _ in range(2):
+            status, body = _get(port, TAKEOFF_QUERY)
+            assert status == 200, body
+            assert body["objects_in_corridor"] in (0, 1)
+    finally:
+        # Сигнал всей группе: главному процессу, воркерам и менеджеру состояния Sanic
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
@@ -0,0 +1,114 @@
+import asyncio
+
+import numpy as np
+from aiohttp import web
+
+from tle_samples import ISS_LINE1, ISS_LINE2, ISS_NAME
+from satellite_tracker import tle_importer
+
+
+def _with_checksum(line: bytes) -> bytes:
+    """
+    Пересчитывает контрольную сумму строки TLE (последний символ).
+    """
+    total = sum(int(c) if c.isdigit() else c == "-" for c in line[:-1].decode())
+    return line[:-1] + str(total % 10).encode()
+
+
+def _replace(line: bytes, start: int, value: bytes) -> bytes:
+    return line[:start] + value + line[start + len(value):]
+
+
+def test_parse_accepts_valid_tle(iss_records):
+    assert iss_records["number"].tolist() == [25544]
+    assert iss_records["line1"][0] == ISS_LINE1
+    assert iss_records["line2"][0] == ISS_LINE2
+
+
+def test_parse_rejects_bad_checksum():
+    # Искаженные цифры эпохи и наклонения без пересчета контрольной суммы
+    corrupted1 = _replace(ISS_LINE1, 20, b"5")
+    corrupted2 = _replace(ISS_LINE2, 12, b"2")
+
+    records = tle_importer._parse_tle_records(
+        [ISS_NAME] * 3, [corrupted1, ISS_LINE1, ISS_LINE1], [ISS_LINE2, corrupted2, ISS_LINE2]
+    )
+
+    assert records["number"].tolist() == [25544]
+
+
+def test_parse_rejects_alpha5_and_malformed_rows():
+    alpha5 = _with_checksum(_replace(ISS_LINE1, 2, b"A5544"))
+    not_a_number = _with_checksum(_replace(ISS_LINE1, 2, b"  12."))
+    leading_zeros = _with_checksum(_replace(ISS_LINE1, 2, b"00005"))
+    line1s = [alpha5, not_a_number, ISS_LINE1[:-1], ISS_LINE1, leading_zeros]
+    line2s = [ISS_LINE2, ISS_LINE2, ISS_LINE2, ISS_LINE2 + b"0", ISS_LINE2]
+
+    records = tle_importer._parse_tle_records([ISS_NAME] * len(line1s), line1s, line2s)
+
+    assert records["number"].tolist() == [5]
+
+
+class _CelestrakStandIn:
+    """
+    Локальная подмена CelesTrak: отдает TLE МКС с ETag и отвечает 304
+    на условный запрос или 503, если включен режим отказа.
+    """
+
+    ETAG = '"iss-v1"'
+
+    def __init__(self):
+        self.statuses = []
+        self.failing = False
+
+    async def handle(self, request):
+        if self.failing:
+            status = 503
+            response = web.Response(status=status)
+        elif request.headers.get("If-None-Match") == self.ETAG:
+            status = 304
+            response = web.Response(status=status, headers={"ETag": self.ETAG})
+        else:
+            status = 200
+            body = b"\r\n".join([ISS_NAME.ljust(24), ISS_LINE1, ISS_LINE2]) + b"\r\n"
+            response = web.Response(body=body, headers={"ETag": self.ETAG})
+        self.statuses.append(status)
+        return response
+
+
+async def _fetch_rounds(stand_in, monkeypatch):
+    app = web.Application()
+    app.router.add_get("/gp.php", stand_in.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        host, port = runner.addresses[0][:2]
+        monkeypatch.setattr(
+            tle_importer, "_URLS", (("active", f"http://{host}:{port}/gp.php?GROUP=active"),)
+        )
+        # Нулевой срок жизни: каждая загрузка идет в сеть
+        monkeypatch.setitem(tle_importer.CACHE_TTLS, "active", 0)
+
+        fetched = await tle_importer.fetch_all_trackable_objects()
+        revalidated = await tle_importer.fetch_all_trackable_objects()
+        stand_in.failing = True
+        fallback = await tle_importer.fetch_all_trackable_objects()
+        return fetched, revalidated, fallback
+    finally:
+        await runner.cleanup()
+
+
+def test_fetch_revalidates_and_falls_back_to_stale_cache(cache_dir, monkeypatch):
+    stand_in = _CelestrakStandIn()
+
+    fetched, revalidated, fallback = asyncio.run(_fetch_rounds(stand_in, monkeypatch))
+
+    assert stand_in.statuses == [200, 304, 503]
+    for records in (fetched, revalidated, fallback):
+        assert records["number"].tolist() == [25544]
+        assert records["line1"][0] == ISS_LINE1
+    header, cached = tle_importer._load_group("active")
+    assert header["etag"].decode() == stand_in.ETAG
+    assert np.array_equal(cached["number"], [25544])
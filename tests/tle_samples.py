@@ -0,0 +1,11 @@
+"""
+Общие тестовые данные: корень репозитория и эталонный TLE МКС.
+"""
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Эталонный TLE МКС (пример из документации формата), контрольные суммы корректны
+ISS_NAME = b"ISS (ZARYA)"
+ISS_LINE1 = b"1 25544U 98067A   08264.51782528 -.00002182  00000-0 -11606-4 0  2927"
+ISS_LINE2 = b"2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391563537"
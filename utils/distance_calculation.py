@@ -1,7 +1,26 @@
-from math import cos, sqrt
+from math import cos, pi, sqrt
+
+import numpy as np
 
 
 def quick_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> int:
     x = lat2 - lat1
     y = (lng2 - lng1) * cos((lat2 + lat1) * 0.00872664626)
     return int(111138 * sqrt(x * x + y * y))
+
+
+# Радиус Земли (м), согласованный с коэффициентом 111138 м/градус в quick_distance
+EARTH_RADIUS_M = 111138 * 180 / pi
+
+
+def haversine_np(lats: np.ndarray, lngs: np.ndarray, lat0: float, lng0: float) -> np.ndarray:
+    """
+    Векторно рассчитывает расстояния (м) от массива точек до одной точки по формуле гаверсинусов.
+    """
+    lat1 = np.deg2rad(lats)
+    lat2 = np.deg2rad(lat0)
+    dlat = lat2 - lat1
+    dlng = np.deg2rad(lng0 - lngs)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    # Ограничение сверху защищает arcsin от ошибок округления для антиподов
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
@@ -1,4 +1,9 @@
 import math
+from bisect import bisect_left
+from typing import Dict
+
+import numpy as np
+from numba import njit
 
 # Константы, используемые в формуле
 # Rз (Радиус Земли, км)
@@ -8,24 +13,90 @@ SEC_PER_YEAR = 31536000
 # Коэффициент для расчета страховой премии (150%)
 INSURANCE_COEFFICIENT = 1.5
 
+# Свернутые константы: 4/3*pi для объема шара и перевод площади из м^2 в км^2
+_FOUR_THIRDS_PI = 4.0 / 3.0 * math.pi
+_M2_TO_KM2 = 1e-6
+
+
+# Пороги вероятности столкновения и соответствующие классы риска (по возрастанию);
+# класс выбирается по числу порогов, строго меньших вероятности
+RISK_CLASS_THRESHOLDS = (1e-7, 1e-6, 1e-5, 1e-4, 1e-3, 1e-2)
+RISK_CLASSES = (
+    "A+ (Minimal)",
+    "A (Very Low)",  # > 0.00001%
+    "B (Low)",  # > 0.0001%
+    "C (Moderate)",  # > 0.001%
+    "D (High)",  # > 0.01%
+    "E (Very High)",  # > 0.1%
+    "F (Extremely High)",  # > 1%
+)
+
 
 def assign_risk_class(collision_probability: float) -> str:
     """
     Присваивает класс риска на основе вероятности столкновения.
     """
-    if collision_probability > 1e-2:  # > 1%
-        return "F (Extremely High)"
-    if collision_probability > 1e-3:  # > 0.1%
-        return "E (Very High)"
-    if collision_probability > 1e-4:  # > 0.01%
-        return "D (High)"
-    if collision_probability > 1e-5:  # > 0.001%
-        return "C (Moderate)"
-    if collision_probability > 1e-6:  # > 0.0001%
-        return "B (Low)"
-    if collision_probability > 1e-7:  # > 0.00001%
-        return "A (Very Low)"
-    return "A+ (Minimal)"
+    return RISK_CLASSES[bisect_left(RISK_CLASS_THRESHOLDS, collision_probability)]
+
+
+def assign_risk_classes(collision_probability: np.ndarray) -> np.ndarray:
+    """
+    Векторный вариант assign_risk_class для массива вероятностей.
+    """
+    indices = np.searchsorted(RISK_CLASS_THRESHOLDS, collision_probability, side="left")
+    # searchsorted ставит NaN в конец, а bisect_left в скалярной версии - в начало
+    indices = np.where(np.isnan(collision_probability), 0, indices)
+    return np.asarray(RISK_CLASSES)[indices]
+
+
+@njit(cache=True)
+def _shell_collision_probability(N_objects, H_upper, H_lower, V_rel, A_effective, T_years):
+    """
+    Вероятность столкновения в сферическом слое высот за срок миссии.
+    """
+    R_upper = R_EARTH_KM + H_upper
+    R_lower = R_EARTH_KM + H_lower
+    V_shell = _FOUR_THIRDS_PI * (R_upper**3 - R_lower**3)
+
+    if V_shell <= 0:
+        raise ValueError("Invalid altitude range, shell volume is zero or negative.")
+
+    # Ожидаемое число столкновений: плотность * V_отн * площадь * время (в секундах)
+    expected_collisions = (
+        N_objects * V_rel * A_effective * T_years * (_M2_TO_KM2 * SEC_PER_YEAR) / V_shell
+    )
+    # expm1 сохраняет точность для малых вероятностей, где 1 - exp(-x) округляется до нуля
+    return -math.expm1(-expected_collisions)
+
+
+@njit(cache=True)
+def _corridor_collision_probability(
+    N_objects, H_ascent, launch_cylinder_radius_m, V_rel, A_rocket, T_seconds
+):
+    """
+    Вероятность столкновения в цилиндрическом коридоре выведения.
+    """
+    # Объем считается как объем цилиндра
+    # launch_cylinder_radius_m переводится в км для соответствия с H_ascent
+    launch_cylinder_radius_km = launch_cylinder_radius_m / 1000.0
+    V_corridor = math.pi * (launch_cylinder_radius_km**2) * H_ascent
+
+    if V_corridor <= 0:
+        raise ValueError(
+            "Invalid ascent altitude or radius, corridor volume is zero or negative."
+        )
+
+    expected_collisions = N_objects * V_rel * A_rocket * _M2_TO_KM2 * T_seconds / V_corridor
+    return -math.expm1(-expected_collisions)
+
+
+def warm_up_risk_kernels() -> None:
+    """
+    Компилирует (или загружает из кэша на диске) Numba-ядра расчета риска,
+    чтобы первый запрос не ждал компиляции.
+    """
+    _shell_collision_probability(0.0, 1.0, 0.0, 0.0, 0.0, 0.0)
+    _corridor_collision_probability(0.0, 1.0, 1.0, 0.0, 0.0, 0.0)
 
 
 def calculate_collision_financial_risk(
@@ -41,20 +112,16 @@ def calculate_collision_financial_risk(
     """
     Рассчитывает ожидаемый финансовый риск (ФР) из-за столкновения
     космического аппарата с мусором за весь срок миссии.
+    Для вырожденного слоя высот выбрасывает ValueError.
     """
-    R_upper = R_EARTH_KM + H_upper
-    R_lower = R_EARTH_KM + H_lower
-    V_shell = (4 / 3) * math.pi * (R_upper**3 - R_lower**3)
-
-    if V_shell <= 0:
-        return {"error": "Invalid altitude range, shell volume is zero or negative."}
-
-    density = N_objects / V_shell
-    T_seconds = T_years * SEC_PER_YEAR
-    A_effective_km2 = A_effective / 1_000_000
-
-    expected_collisions = density * V_rel * A_effective_km2 * T_seconds
-    P_collision = 1.0 - math.exp(-expected_collisions)
+    P_collision = _shell_collision_probability(
+        float(N_objects),
+        float(H_upper),
+        float(H_lower),
+        float(V_rel),
+        float(A_effective),
+        float(T_years),
+    )
 
     total_cost_at_risk = C_full + D_lost
     financial_risk = P_collision * total_cost_at_risk
@@ -81,22 +148,16 @@ def calculate_launch_collision_risk(
     """
     Рассчитывает ожидаемый финансовый риск (ФР) из-за столкновения
     ракеты-носителя или спутника с мусором во время активного участка выведения.
+    Для вырожденного коридора выведения выбрасывает ValueError.
     """
-    # Объем считается как объем цилиндра
-    # launch_cylinder_radius_m переводится в км для соответствия с H_ascent
-    launch_cylinder_radius_km = launch_cylinder_radius_m / 1000.0
-    V_corridor = math.pi * (launch_cylinder_radius_km**2) * H_ascent
-
-    if V_corridor <= 0:
-        return {
-            "error": "Invalid ascent altitude or radius, corridor volume is zero or negative."
-        }
-
-    density = N_objects / V_corridor
-    A_rocket_km2 = A_rocket / 1_000_000
-
-    expected_collisions = density * V_rel * A_rocket_km2 * T_seconds
-    P_collision = 1.0 - math.exp(-expected_collisions)
+    P_collision = _corridor_collision_probability(
+        float(N_objects),
+        float(H_ascent),
+        float(launch_cylinder_radius_m),
+        float(V_rel),
+        float(A_rocket),
+        float(T_seconds),
+    )
     financial_risk = P_collision * C_total_loss
 
     insurance_premium = financial_risk * INSURANCE_COEFFICIENT
@@ -109,3 +170,73 @@ def calculate_launch_collision_risk(
         "risk_class": risk_class,
     }
 
+
+def calculate_collision_financial_risk_batch(
+    N_objects: np.ndarray,
+    H_upper: np.ndarray,
+    H_lower: np.ndarray,
+    V_rel: np.ndarray,
+    A_effective: np.ndarray,
+    T_years: np.ndarray,
+    C_full: np.ndarray,
+    D_lost: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Векторный вариант calculate_collision_financial_risk для перебора параметров:
+    аргументы - массивы (или скаляры) совместимой формы, результат - массивы той же формы.
+    Для вырожденных слоев высот выбрасывает ValueError.
+    """
+    R_upper = R_EARTH_KM + np.asarray(H_upper, dtype=np.float64)
+    R_lower = R_EARTH_KM + np.asarray(H_lower, dtype=np.float64)
+    V_shell = _FOUR_THIRDS_PI * (R_upper**3 - R_lower**3)
+
+    if np.any(V_shell <= 0):
+        raise ValueError("Invalid altitude range, shell volume is zero or negative.")
+
+    expected_collisions = (
+        np.asarray(N_objects) * V_rel * A_effective * T_years * (_M2_TO_KM2 * SEC_PER_YEAR) / V_shell
+    )
+    P_collision = -np.expm1(-expected_collisions)
+
+    financial_risk = P_collision * (np.asarray(C_full) + D_lost)
+
+    return {
+        "financial_risk": np.round(financial_risk, 2),
+        "collision_risk": P_collision,
+        "insurance_premium": np.round(financial_risk * INSURANCE_COEFFICIENT, 2),
+        "risk_class": assign_risk_classes(P_collision),
+    }
+
+
+def calculate_launch_collision_risk_batch(
+    N_objects: np.ndarray,
+    H_ascent: np.ndarray,
+    launch_cylinder_radius_m: np.ndarray,
+    V_rel: np.ndarray,
+    A_rocket: np.ndarray,
+    T_seconds: np.ndarray,
+    C_total_loss: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Векторный вариант calculate_launch_collision_risk для перебора параметров:
+    аргументы - массивы (или скаляры) совместимой формы, результат - массивы той же формы.
+    Для вырожденных коридоров выведения выбрасывает ValueError.
+    """
+    launch_cylinder_radius_km = np.asarray(launch_cylinder_radius_m, dtype=np.float64) / 1000.0
+    V_corridor = math.pi * (launch_cylinder_radius_km**2) * H_ascent
+
+    if np.any(V_corridor <= 0):
+        raise ValueError(
+            "Invalid ascent altitude or radius, corridor volume is zero or negative."
+        )
+
+    expected_collisions = np.asarray(N_objects) * V_rel * A_rocket * _M2_TO_KM2 * T_seconds / V_corridor
+    P_collision = -np.expm1(-expected_collisions)
+    financial_risk = P_collision * C_total_loss
+
+    return {
+        "financial_risk": np.round(financial_risk, 2),
+        "collision_risk": P_collision,
+        "insurance_premium": np.round(financial_risk * INSURANCE_COEFFICIENT, 2),
+        "risk_class": assign_risk_classes(P_collision),
+    }